@@ -12,141 +12,728 @@ Examples:
 """
 
 import argparse
+import io
+import mmap
+import multiprocessing
+import os
 import re
 import sys
-from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Tuple
+from array import array
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-MAX_CAN_DLC = 8
+import numpy as np
+
+from candump_frames import HAVE_NUMBA, HEXVAL, MAX_CAN_DLC, Frame, FrameTable, concat_tables, frame_columns, njit
+
+CHUNK_FRAMES = 65536
+MAX_BAD_SAMPLES = 10              # unparsed lines echoed with --verbose
+PARALLEL_MIN_BYTES = 8 << 20      # smaller dumps always parse in-process
+DENSE_ID_LIMIT = 1 << 16          # IDs below this are densified through a lookup table
+MONITOR_FLUSH_LINES = 4096        # buffered monitor/read-mode lines per stdout write
+STREAM_MIN_BYTES = 256 << 20      # explicit-window runs stream dumps at least this big
+_HEX_BYTE = tuple(f"{b:02X}" for b in range(256))
 
 # ---------- Parsing ----------
 
+# Anchored patterns: [0] for "(ts) IFACE ..." lines, [1] for plain "IFACE ..." lines.
+# IFACE is any interface name: can0, vcan0 (canplayer replays), slcan0 (slcan adapters) ...
+_CAN_FIELDS = r"""
+    [A-Za-z][\w-]* \s+
+    (?P<id>[0-9A-Fa-f]{1,8}) \s+
+    \[ (?P<dlc>\d{1,2}) \] \s+
+    # at most 8 single-space separated pairs, so no backtracking over trailing whitespace
+    (?P<data>[0-9A-Fa-f]{2} (?:[ ][0-9A-Fa-f]{2}){0,7})
+"""
 candump_patterns = [
-    re.compile(r"\((?P<ts>[\d\.]+)\)\s+can\d+\s+(?P<id>[0-9A-Fa-f]+)\s+\[(?P<dlc>\d+)\]\s+(?P<data>(?:[0-9A-Fa-f]{2}\s*)+)"),
-    re.compile(r"(?:can\d+\s+)(?P<id>[0-9A-Fa-f]+)\s+\[(?P<dlc>\d+)\]\s+(?P<data>(?:[0-9A-Fa-f]{2}\s*)+)"),
+    re.compile(r"\( (?P<ts>\d+\.?\d*|\.\d+) \) \s+" + _CAN_FIELDS, re.X),
+    re.compile(_CAN_FIELDS, re.X),
 ]
-
-@dataclass
-class Frame:
-    ts: Optional[float]
-    can_id: int
-    dlc: int
-    data: bytes
-
-def parse_candump(path: str, limit: Optional[int], verbose: bool) -> List[Frame]:
-    frames: List[Frame] = []
+_TS_MATCH = candump_patterns[0].match
+_NOTS_MATCH = candump_patterns[1].match
+
+def _materialize(frames: Iterable[Frame]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pack frames into (ids[N], lens uint8[N], data uint8[N,8]); short payloads are zero-padded."""
+    if isinstance(frames, FrameTable):
+        return frames.ids, frames.lens, frames.D
+    frames = frames if isinstance(frames, list) else list(frames)
+    n = len(frames)
+    ids = np.fromiter((f.can_id for f in frames), dtype=np.int32, count=n)
+    lens = np.fromiter((len(f.data) for f in frames), dtype=np.uint8, count=n)
+    raw = b"".join(f.data.ljust(MAX_CAN_DLC, b"\0") for f in frames)
+    D = np.frombuffer(raw, dtype=np.uint8).reshape(n, MAX_CAN_DLC)
+    return ids, lens, D
+
+def _dense_ids(ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Same as np.unique(ids, return_index=True, return_inverse=True, return_counts=True).
+    Standard 11-bit (and any < 2**16) IDs go through a lookup table in O(N) instead of a sort."""
+    n = len(ids)
+    if n == 0 or int(ids.max()) >= DENSE_ID_LIMIT:
+        return np.unique(ids, return_index=True, return_inverse=True, return_counts=True)
+    counts_all = np.bincount(ids)
+    uniq = np.flatnonzero(counts_all)
+    lut = np.zeros(len(counts_all), dtype=np.intp)
+    lut[uniq] = np.arange(len(uniq))
+    inverse = lut[ids]
+    first = np.full(len(uniq), n, dtype=np.intp)
+    np.minimum.at(first, inverse, np.arange(n))
+    return uniq.astype(ids.dtype), first, inverse, counts_all[uniq]
+
+def _iter_chunks(frames: Iterable[Frame], size: int) -> Iterable[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    if isinstance(frames, (FrameTable, FrameStream)):
+        # Re-cut tables into exact size-frame chunks so progress counts stay aligned
+        rest = None
+        for table in (frames.tables() if isinstance(frames, FrameStream) else [frames]):
+            if rest is not None:
+                table = concat_tables([rest, table])
+            full = len(table) - len(table) % size
+            for start in range(0, full, size):
+                yield _materialize(table[start:start + size])
+            rest = table[full:]
+        if rest is not None and len(rest):
+            yield _materialize(rest)
+        return
+    it = iter(frames)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield _materialize(chunk)
+
+ParseResult = Tuple[FrameTable, int, List[Tuple[int, str]], int]  # frames, bad lines, (lineno, line) samples, lines read
+
+def _parse_text(lines: Iterable[str], limit: Optional[int]) -> ParseResult:
+    # Columns accumulate in compact C arrays and become NumPy views at the end
+    ts_col, id_col, dlc_col, len_col = array("d"), array("I"), array("B"), array("B")
+    data_col = bytearray()
+    nan = float("nan")
+    ts_re = candump_patterns[0]
+    ts_match, nots_match = _TS_MATCH, _NOTS_MATCH  # locals: no global lookup per line
+    n = 0
     bad_lines = 0
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for lineno, raw in enumerate(f, start=1):
-            if limit is not None and len(frames) >= limit:
-                break
-            line = raw.strip()
-            if not line:
-                continue
-            m = None
-            for pat in candump_patterns:
-                m = pat.search(line)
-                if m:
-                    break
-            if not m:
-                bad_lines += 1
-                if verbose and bad_lines <= 10:
-                    print(f"[DBG] Unparsed line {lineno}: {line}")
-                continue
-            ts = float(m.group("ts")) if "ts" in m.groupdict() and m.group("ts") else None
+    samples: List[Tuple[int, str]] = []
+    lineno = 0
+    for lineno, raw in enumerate(lines, start=1):
+        if limit is not None and n >= limit:
+            lineno -= 1
+            break
+        line = raw.strip()
+        if not line:
+            continue
+        # Cheap prefilter: pick exactly one pattern by the leading char
+        m = ts_match(line) if line[0] == "(" else nots_match(line)
+        if m:
             try:
-                can_id = int(m.group("id"), 16)
-                dlc = int(m.group("dlc"))
-                data_bytes = bytes(int(b, 16) for b in m.group("data").split())[:dlc]
-            except Exception as e:
-                bad_lines += 1
-                if verbose:
-                    print(f"[DBG] Parse error line {lineno}: {e} :: {line}")
-                continue
-            frames.append(Frame(ts, can_id, dlc, data_bytes))
+                ts = float(m.group("ts")) if m.re is ts_re else nan
+                id_hex, dlc_str, data_hex = m.group("id", "dlc", "data")
+                can_id = int(id_hex, 16)
+                dlc = int(dlc_str)
+                # fromhex skips the single spaces between pairs itself
+                data_bytes = bytes.fromhex(data_hex)[:dlc]
+            except ValueError:
+                m = None
+        if not m:
+            bad_lines += 1
+            if bad_lines <= MAX_BAD_SAMPLES:
+                samples.append((lineno, line))
+            continue
+        ts_col.append(ts)
+        id_col.append(can_id)
+        dlc_col.append(dlc)
+        len_col.append(len(data_bytes))
+        data_col += data_bytes.ljust(MAX_CAN_DLC, b"\0")
+        n += 1
+
+    frames = FrameTable(
+        np.frombuffer(ts_col, dtype=np.float64),
+        np.frombuffer(id_col, dtype=np.uint32),
+        np.frombuffer(dlc_col, dtype=np.uint8),
+        np.frombuffer(len_col, dtype=np.uint8),
+        np.frombuffer(data_col, dtype=np.uint8).reshape(n, MAX_CAN_DLC),
+    )
+    return frames, bad_lines, samples, lineno
+
+# Byte-level parser for the same two layouts, used when numba is available.
+# On ASCII input it accepts exactly what candump_patterns accept on a stripped line
+# (tests/test_parse_equivalence.py holds it to that).
+@njit(cache=True, nogil=True)
+def _is_space(c):
+    # ASCII whitespace as str.strip() and the str patterns' \s see it, incl. \x1c-\x1f
+    return c == 32 or (c >= 9 and c <= 13) or (c >= 28 and c <= 31)
+
+@njit(cache=True, nogil=True)
+def _is_alpha(c):
+    return (c >= 65 and c <= 90) or (c >= 97 and c <= 122)
+
+@njit(cache=True, nogil=True)
+def _skip_spaces(buf, p, e):
+    while p < e and _is_space(buf[p]):
+        p += 1
+    return p
+
+@njit(cache=True, nogil=True)
+def _line_end(buf, p):
+    """Index of the line terminator at/after p; like text-mode files, \n, \r and \r\n all end a line."""
+    size = buf.shape[0]
+    while p < size and buf[p] != 10 and buf[p] != 13:
+        p += 1
+    return p
+
+@njit(cache=True, nogil=True)
+def _next_line(buf, e):
+    if e + 1 < buf.shape[0] and buf[e] == 13 and buf[e + 1] == 10:
+        return e + 2
+    return e + 1
+
+@njit(cache=True, nogil=True)
+def _count_lines(buf):
+    n = 0
+    p = 0
+    while p < buf.shape[0]:
+        p = _next_line(buf, _line_end(buf, p))
+        n += 1
+    return n
+
+@njit(cache=True, nogil=True)
+def _parse_line(buf, p, e, k, ts, ids, dlcs, lens, D):
+    """Parse buf[p:e] (already stripped) into row k. Returns 1 on success, 0 if unparsed,
+    -1 if the timestamp has too many digits to convert exactly here."""
+    t = np.nan
+    if buf[p] == 40:  # "("
+        p += 1
+        start = p
+        mant = 0
+        digits = 0
+        frac = -1
+        while p < e and (buf[p] == 46 or (buf[p] >= 48 and buf[p] <= 57)):
+            if buf[p] == 46:
+                if frac >= 0:
+                    return 0
+                frac = 0
+            else:
+                if digits < 18:
+                    mant = mant * 10 + (buf[p] - 48)
+                digits += 1
+                if frac >= 0:
+                    frac += 1
+            p += 1
+        if p == start or digits == 0 or p >= e or buf[p] != 41:  # ")"
+            return 0
+        if digits > 18 or mant >= 2**53 or frac > 22:
+            return -1
+        # Both operands are exact doubles, so one division rounds the same way float() does
+        t = mant / 10.0 ** max(frac, 0)
+        q = _skip_spaces(buf, p + 1, e)
+        if q == p + 1:
+            return 0
+        p = q
+    if p >= e or not _is_alpha(buf[p]):  # interface name: a letter, then [A-Za-z0-9_-]*
+        return 0
+    q = p + 1
+    while q < e and (_is_alpha(buf[q]) or (buf[q] >= 48 and buf[q] <= 57) or buf[q] == 95 or buf[q] == 45):
+        q += 1
+    p = _skip_spaces(buf, q, e)
+    if p == q:
+        return 0
+    can_id = 0
+    q = p
+    while q < e and q - p < 8 and HEXVAL[buf[q]] >= 0:
+        can_id = can_id * 16 + HEXVAL[buf[q]]
+        q += 1
+    if q == p:
+        return 0
+    p = _skip_spaces(buf, q, e)
+    if p == q or p >= e or buf[p] != 91:  # "["
+        return 0
+    p += 1
+    dlc = 0
+    q = p
+    while q < e and q - p < 2 and buf[q] >= 48 and buf[q] <= 57:
+        dlc = dlc * 10 + (buf[q] - 48)
+        q += 1
+    if q == p or q >= e or buf[q] != 93:  # "]"
+        return 0
+    p = _skip_spaces(buf, q + 1, e)
+    if p == q + 1 or p + 2 > e or HEXVAL[buf[p]] < 0 or HEXVAL[buf[p + 1]] < 0:
+        return 0
+    if dlc > 0:
+        D[k, 0] = HEXVAL[buf[p]] * 16 + HEXVAL[buf[p + 1]]
+    nb = 1
+    p += 2
+    while nb < 8 and p + 3 <= e and buf[p] == 32 and HEXVAL[buf[p + 1]] >= 0 and HEXVAL[buf[p + 2]] >= 0:
+        if nb < dlc:
+            D[k, nb] = HEXVAL[buf[p + 1]] * 16 + HEXVAL[buf[p + 2]]
+        nb += 1
+        p += 3
+    ts[k] = t
+    ids[k] = can_id
+    dlcs[k] = dlc
+    lens[k] = min(nb, dlc)
+    return 1
+
+@njit(cache=True, nogil=True)
+def _parse_buf(buf, limit, ts, ids, dlcs, lens, D, bad_samples):
+    """Scan every line of buf; returns (frames, bad_lines, ok, lines_read). ok is False
+    when a timestamp needs the regex parser. bad_samples gets (lineno, start, end) rows."""
+    size = buf.shape[0]
+    n = 0
+    bad = 0
+    lineno = 0
+    p = 0
+    while p < size:
+        if limit >= 0 and n >= limit:
+            break
+        e = _line_end(buf, p)
+        lineno += 1
+        ls = _skip_spaces(buf, p, e)
+        le = e
+        while le > ls and _is_space(buf[le - 1]):
+            le -= 1
+        p = _next_line(buf, e)
+        if ls == le:
+            continue
+        r = _parse_line(buf, ls, le, n, ts, ids, dlcs, lens, D)
+        if r < 0:
+            return n, bad, False, lineno
+        if r == 1:
+            n += 1
+        else:
+            if bad < bad_samples.shape[0]:
+                bad_samples[bad, 0] = lineno
+                bad_samples[bad, 1] = ls
+                bad_samples[bad, 2] = le
+            bad += 1
+    return n, bad, True, lineno
+
+def _parse_bytes(buf: np.ndarray, limit: Optional[int]) -> Optional[ParseResult]:
+    """Run _parse_buf over a uint8 view of the dump; None means use the regex parser instead."""
+    cap = _count_lines(buf)
+    if limit is not None:
+        cap = min(cap, limit)
+    ts = np.empty(cap, dtype=np.float64)
+    ids = np.empty(cap, dtype=np.uint32)
+    dlcs = np.empty(cap, dtype=np.uint8)
+    lens = np.empty(cap, dtype=np.uint8)
+    D = np.zeros((cap, MAX_CAN_DLC), dtype=np.uint8)
+    bad_samples = np.zeros((MAX_BAD_SAMPLES, 3), dtype=np.int64)
+    n, bad_lines, ok, nlines = _parse_buf(buf, -1 if limit is None else limit, ts, ids, dlcs, lens, D, bad_samples)
+    if not ok:
+        return None
+    samples = [(lineno, buf[s:e].tobytes().decode("utf-8", errors="ignore"))
+               for lineno, s, e in bad_samples[:min(bad_lines, MAX_BAD_SAMPLES)].tolist()]
+    return FrameTable(ts[:n], ids[:n], dlcs[:n], lens[:n], D[:n]), bad_lines, samples, nlines
+
+# Whole-buffer fast path for dumps made only of "(ts) IFACE ..." and/or "IFACE ..." lines,
+# used when numba is missing: one bytes regex pass straight over the mmap (the timestamp
+# group is optional, so both layouts match once), no line splitting or decoding, then
+# column-wise conversion in NumPy. A match only starts at a line start and ends at the
+# line end, so "as many matches as non-blank lines" means every line was a frame.
+_FRAME_LINE = re.compile(rb"""
+    ^ [ \t\f\v]*
+    (?: \( (\d+\.?\d*|\.\d+) \) [ \t\f\v]+ )?        # optional "(ts)"
+    [A-Za-z][\w-]* [ \t\f\v]+                          # interface name
+    ([0-9A-Fa-f]{1,8}) [ \t\f\v]+                      # id
+    \[ (\d{1,2}) \] [ \t\f\v]+                         # [dlc]
+    ([0-9A-Fa-f]{2} (?:[ ][0-9A-Fa-f]{2}){0,7})        # data
+    [^\r\n]*
+""", re.M | re.X)
+_NONBLANK_LINE = re.compile(rb"([^ \t\n\r\f\v])[^\r\n]*")
+
+def _count_line_breaks(buf, start: int, end: int) -> int:
+    """Line terminators in buf[start:end], counting \\r\\n once as text mode does."""
+    a = np.frombuffer(buf, dtype=np.uint8)[start:end]
+    n = int(np.count_nonzero(a == 10))
+    cr = a == 13
+    if cr.any():
+        n += int(np.count_nonzero(cr)) - int(np.count_nonzero(cr[:-1] & (a[1:] == 10)))
+    return n
+
+def _scan_frame_lines(buf, start: int, end: int, limit: Optional[int]) -> Optional[ParseResult]:
+    """Parse buf[start:end] with _FRAME_LINE; None when any line needs the line-based parser."""
+    first = _NONBLANK_LINE.search(buf, start, end)
+    if first is not None and first.group(1) != b"(" and not first.group(1).isalpha():
+        return None
+    if limit is None:
+        rows = _FRAME_LINE.findall(buf, start, end)
+        stop = end
+    else:
+        rows = []
+        stop = start
+        for m in islice(_FRAME_LINE.finditer(buf, start, end), limit):
+            rows.append(m.groups(b""))
+            stop = m.end()
+        if len(rows) < limit:
+            stop = end
+    if len(_NONBLANK_LINE.findall(buf, start, stop)) != len(rows):
+        return None
+    n = len(rows)
+    frames = frame_columns(rows)
+    if stop < end or limit == 0:
+        # Stopped on the limit: lines read ends with the last frame's line
+        nlines = _count_line_breaks(buf, start, stop) + 1 if n else 0
+    else:
+        nlines = _count_line_breaks(buf, start, end)
+        if end > start and buf[end - 1] not in b"\r\n":
+            nlines += 1
+    return frames, 0, [], nlines
+
+def _line_ranges(mm: mmap.mmap, size: int, step: int) -> Iterable[Tuple[int, int]]:
+    """Cut [0, size) into ranges of about step bytes, each ending just past a newline."""
+    start = 0
+    while start < size:
+        nl = mm.find(b"\n", start + step)
+        end = size if nl < 0 else nl + 1
+        yield start, end
+        start = end
+
+def _parse_mapped(mm: mmap.mmap, start: int, end: int, limit: Optional[int]) -> Optional[ParseResult]:
+    """Byte-level parsers over the mapped dump; None means only the line-based parser will do."""
+    buf = np.frombuffer(mm, dtype=np.uint8)[start:end]
+    # The text parser decodes with errors="ignore", dropping invalid UTF-8 mid-line; only
+    # pure-ASCII input parses the same byte for byte
+    parsed = None
+    ascii_only = not buf.size or buf.max() < 0x80
+    if ascii_only and HAVE_NUMBA:
+        parsed = _parse_bytes(buf, limit)
+    del buf  # the mmap cannot close while a NumPy view still exports it
+    if parsed is None and ascii_only:
+        parsed = _scan_frame_lines(mm, start, end, limit)
+    return parsed
+
+def _parse_window(mm: mmap.mmap, start: int, end: int, limit: Optional[int]) -> ParseResult:
+    parsed = _parse_mapped(mm, start, end, limit)
+    if parsed is not None:
+        return parsed
+    return _parse_text(io.TextIOWrapper(io.BytesIO(mm[start:end]), encoding="utf-8", errors="ignore"), limit)
+
+def _parse_range(task: Tuple[str, int, int]) -> ParseResult:
+    """Parse bytes [start, end) of a dump in a --jobs worker; the file is re-mmapped rather than pickled."""
+    path, start, end = task
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _parse_window(mm, start, end, None)
+
+def _parse_parallel(path: str, size: int, jobs: int) -> ParseResult:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        tasks = [(path, a, b) for a, b in _line_ranges(mm, size, -(-size // jobs))]
+    with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+        results = pool.map(_parse_range, tasks)
+    return _merge_results(results)
+
+def _merge_results(results: List[ParseResult]) -> ParseResult:
+    """Join per-range results in file order, renumbering sample lines to whole-file line numbers."""
+    bad_lines = 0
+    samples: List[Tuple[int, str]] = []
+    line_base = 0
+    for _, bad, part_samples, nlines in results:
+        bad_lines += bad
+        samples.extend((line_base + lineno, line) for lineno, line in part_samples)
+        line_base += nlines
+    return concat_tables([r[0] for r in results]), bad_lines, samples[:MAX_BAD_SAMPLES], line_base
+
+def parse_candump(path: str, limit: Optional[int], verbose: bool, jobs: int = 1) -> FrameTable:
+    size = os.path.getsize(path)
+    parsed = None
+    if jobs > 1 and limit is None and size >= PARALLEL_MIN_BYTES:
+        parsed = _parse_parallel(path, size, jobs)
+    elif size > 0:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            parsed = _parse_mapped(mm, 0, size, limit)
+    if parsed is None:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            parsed = _parse_text(f, limit)
+    frames, bad_lines, samples, _ = parsed
+    _log_parse(len(frames), bad_lines, samples, frames[0] if frames else None, frames[-1] if frames else None, verbose)
+    return frames
 
+def _log_parse(n: int, bad_lines: int, samples: List[Tuple[int, str]],
+               first: Optional[Frame], last: Optional[Frame], verbose: bool):
     if verbose:
-        print(f"[INFO] Parsed frames: {len(frames)} (bad/unparsed lines: {bad_lines})")
-        if frames:
-            print(f"[INFO] First frame: ts={frames[0].ts} id=0x{frames[0].can_id:03X} dlc={frames[0].dlc} data={frames[0].data.hex(' ')}")
-            print(f"[INFO] Last  frame: ts={frames[-1].ts} id=0x{frames[-1].can_id:03X} dlc={frames[-1].dlc} data={frames[-1].data.hex(' ')}")
-    if not frames:
+        for lineno, line in samples:
+            print(f"[DBG] Unparsed line {lineno}: {line}")
+        print(f"[INFO] Parsed frames: {n} (bad/unparsed lines: {bad_lines})")
+        if n:
+            print(f"[INFO] First frame: ts={first.ts} id=0x{first.can_id:03X} dlc={first.dlc} data={first.data.hex(' ')}")
+            print(f"[INFO] Last  frame: ts={last.ts} id=0x{last.can_id:03X} dlc={last.dlc} data={last.data.hex(' ')}")
+    if not n:
         print("[!] No frames parsed from file. Check format or use --verbose to inspect.", file=sys.stderr)
-    return frames
 
-# ---------- Reverse logic ----------
+class FrameStream:
+    """Re-iterable dump reader that re-parses the file window by window on every pass,
+    so only one window of frames is in memory. Used for very large dumps when no
+    whole-dump analysis runs; the price is one full parse per pass (the up-front
+    __bool__ check, calibrate, monitor and --read each read the file again)."""
+
+    WINDOW_BYTES = 4 << 20
 
-@dataclass
-class ByteState:
-    value: int = 0
-    disqualified: bool = False
+    def __init__(self, path: str, limit: Optional[int], verbose: bool):
+        self.path = path
+        self.limit = limit
+        self.verbose = verbose
+        self._logged = False
+        # First and last frame of the dump, known once a pass has completed
+        self.first: Optional[Frame] = None
+        self.last: Optional[Frame] = None
+
+    def tables(self) -> Iterable[FrameTable]:
+        size = os.path.getsize(self.path)
+        remaining = self.limit
+        n = bad_lines = line_base = 0
+        samples: List[Tuple[int, str]] = []
+        first = last = None
+        if size > 0:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start, end in _line_ranges(mm, size, self.WINDOW_BYTES):
+                    if remaining is not None and remaining <= 0:
+                        break
+                    frames, bad, part_samples, nlines = _parse_window(mm, start, end, remaining)
+                    if remaining is not None:
+                        remaining -= len(frames)
+                    n += len(frames)
+                    bad_lines += bad
+                    samples.extend((line_base + lineno, line) for lineno, line in part_samples)
+                    line_base += nlines
+                    if frames:
+                        first = first or frames[0]
+                        last = frames[-1]
+                    yield frames
+        # Parse stats are logged once, at the end of the first complete pass
+        if not self._logged:
+            self._logged = True
+            self.first, self.last = first, last
+            _log_parse(n, bad_lines, samples[:MAX_BAD_SAMPLES], first, last, self.verbose)
+
+    def __iter__(self) -> Iterable[Frame]:
+        for table in self.tables():
+            yield from table
+
+    def __bool__(self) -> bool:
+        # A complete pass, so the parse summary is printed before any analysis output
+        if not self._logged:
+            for _ in self.tables():
+                pass
+        return self.first is not None
 
-@dataclass
-class IdState:
-    can_id: int
-    seen_len: int = 0
-    fully_disqualified: bool = False
-    bytes: List[ByteState] = field(default_factory=lambda: [ByteState() for _ in range(MAX_CAN_DLC)])
+# ---------- Reverse logic ----------
 
-    def ingest_for_calibration(self, data: bytes):
-        if not data:
-            return
-        self.seen_len = max(self.seen_len, len(data))
-        for i, b in enumerate(data):
-            bs = self.bytes[i]
-            if bs.disqualified:
+@njit(cache=True, nogil=True)
+def _calib_kernel(rows, lens, D, values, disq, seen_len):
+    for k in range(rows.shape[0]):
+        r = rows[k]
+        L = lens[k]
+        if L == 0:
+            continue
+        if L > seen_len[r]:
+            seen_len[r] = L
+        for j in range(L):
+            if disq[r, j]:
                 continue
-            if self.seen_len <= 1 and bs.value == 0:
-                bs.value = b
-            else:
-                if b != bs.value:
-                    bs.disqualified = True
-        self.fully_disqualified = all(self.bytes[i].disqualified for i in range(self.seen_len))
-
-    def diff_and_report(self, data: bytes) -> List[Tuple[int, int, int]]:
-        out = []
-        for i, b in enumerate(data):
-            if i >= self.seen_len:
-                break
-            bs = self.bytes[i]
-            if not bs.disqualified and b != bs.value:
-                out.append((i, bs.value, b))
-                bs.value = b
-        return out
+            if seen_len[r] <= 1 and values[r, j] == 0:
+                values[r, j] = D[k, j]
+            elif D[k, j] != values[r, j]:
+                disq[r, j] = True
+
+@njit(cache=True, nogil=True)
+def _monitor_kernel(rows, lens, D, values, disq, seen_len, out):
+    """Write (frame, byte, old, new) rows into out for every change; returns the count.
+    Frames with row -1 (unknown or dead IDs) are skipped."""
+    n = 0
+    for k in range(rows.shape[0]):
+        r = rows[k]
+        if r < 0:
+            continue
+        L = min(lens[k], seen_len[r])
+        for j in range(L):
+            b = D[k, j]
+            if not disq[r, j] and b != values[r, j]:
+                out[n, 0] = k
+                out[n, 1] = j
+                out[n, 2] = values[r, j]
+                out[n, 3] = b
+                n += 1
+                values[r, j] = b
+    return n
+
+# Same updates as the two kernels above in vectorized NumPy, for when numba is missing
+# (the kernels then run as interpreted Python, slower than plain lists). Frames are
+# grouped per state row with a stable sort, so "earlier frame of the same ID" becomes
+# "previous element of the group".
+
+def _calib_numpy(rows, lens, D, values, disq, seen_len):
+    keep = lens > 0
+    order = np.flatnonzero(keep)[np.argsort(rows[keep], kind="stable")]
+    rows, lens = rows[order].astype(np.int64), lens[order]
+    n = len(rows)
+    if n == 0:
+        return
+    # seen_len as the kernel sees it after each frame: a running max inside each row group
+    # (groups are sorted by row and seen_len <= 8, so row * 16 keeps groups apart)
+    seen = np.maximum.accumulate(rows * 16 + np.maximum(lens, seen_len[rows])) - rows * 16
+    np.maximum.at(seen_len, rows, lens)
+    pos = np.arange(n)
+    for j in range(MAX_CAN_DLC):
+        m = lens > j
+        if not m.any():
+            break
+        r, b, k = rows[m], D[order[m], j], pos[m]
+        v0 = values[r, j]
+        live = ~disq[r, j]
+        # While seen_len <= 1 a zero value takes the byte instead of comparing: the first
+        # nonzero such byte becomes the value and only the bytes after it are compared
+        setting = (seen[m] <= 1) & (v0 == 0) & live
+        takes = setting & (b != 0)
+        first = np.full(len(values), n)
+        np.minimum.at(first, r[takes], k[takes])
+        took = first[r] < n
+        value = np.where(took, D[order[np.minimum(first[r], n - 1)], j], v0)
+        compared = live & ~(setting & ~(took & (k > first[r])))
+        values[r[took], j] = value[took]
+        disq[r[compared & (b != value)], j] = True
+
+def _monitor_numpy(rows, lens, D, values, disq, seen_len, out):
+    chg_k, chg_j, chg_old, chg_new = [], [], [], []
+    valid = np.flatnonzero(rows >= 0)
+    order = valid[np.argsort(rows[valid], kind="stable")]
+    r_all = rows[order]
+    L = np.minimum(lens[order], seen_len[r_all])
+    for j in range(MAX_CAN_DLC):
+        m = (L > j) & ~disq[r_all, j]
+        if not m.any():
+            continue
+        k, r = order[m], r_all[m]
+        b = D[k, j]
+        # Each byte compares against the previous one of its ID, the first against the state
+        head = np.ones(len(r), dtype=np.bool_)
+        head[1:] = r[1:] != r[:-1]
+        prev = np.empty_like(b)
+        prev[1:] = b[:-1]
+        prev[head] = values[r[head], j]
+        ch = b != prev
+        chg_k.append(k[ch]); chg_j.append(np.full(int(ch.sum()), j)); chg_old.append(prev[ch]); chg_new.append(b[ch])
+        tail = np.append(head[1:], True)
+        values[r[tail], j] = b[tail]
+    if not chg_k:
+        return 0
+    k, j = np.concatenate(chg_k), np.concatenate(chg_j)
+    by_frame = np.lexsort((j, k))
+    n = len(by_frame)
+    out[:n, 0] = k[by_frame]
+    out[:n, 1] = j[by_frame]
+    out[:n, 2] = np.concatenate(chg_old)[by_frame]
+    out[:n, 3] = np.concatenate(chg_new)[by_frame]
+    return n
 
 class ReverseTool:
+    """Per-ID byte state kept as parallel arrays; row i belongs to the i-th CAN ID observed."""
+
+    GROW_ROWS = 64
+
     def __init__(self, verbose: bool = False):
-        self.states: Dict[int, IdState] = {}
+        self._id_to_idx: Dict[int, int] = {}
+        self.values = np.zeros((0, MAX_CAN_DLC), dtype=np.uint8)
+        self.disq = np.zeros((0, MAX_CAN_DLC), dtype=np.bool_)
+        self.seen_len = np.zeros(0, dtype=np.uint8)
+        # IDs with at least one byte still qualified after calibration; monitor skips the rest
+        self.live_ids: Set[int] = set()
         self.verbose = verbose
 
-    def _state(self, can_id: int) -> IdState:
-        if can_id not in self.states:
+    def _state(self, can_id: int) -> int:
+        idx = self._id_to_idx.get(can_id)
+        if idx is None:
             if self.verbose:
                 print(f"[DBG] New ID observed: 0x{can_id:03X}")
-            self.states[can_id] = IdState(can_id)
-        return self.states[can_id]
+            idx = len(self._id_to_idx)
+            if idx == len(self.seen_len):
+                self._grow(idx + self.GROW_ROWS)
+            self._id_to_idx[can_id] = idx
+        return idx
+
+    def _grow(self, rows: int):
+        # np.resize would repeat existing rows into the new space, so copy into zeros instead
+        n = len(self.seen_len)
+        values = np.zeros((rows, MAX_CAN_DLC), dtype=np.uint8)
+        disq = np.zeros((rows, MAX_CAN_DLC), dtype=np.bool_)
+        seen_len = np.zeros(rows, dtype=np.uint8)
+        values[:n] = self.values
+        disq[:n] = self.disq
+        seen_len[:n] = self.seen_len
+        self.values, self.disq, self.seen_len = values, disq, seen_len
+
+    def _rows(self, ids: np.ndarray, create: bool) -> np.ndarray:
+        """Map every frame's CAN ID to its state row. With create, unseen IDs get a new row;
+        otherwise only live IDs map and everything else is -1."""
+        uniq, first, inv, _ = _dense_ids(ids)
+        # First-seen order keeps "New ID observed" logging in stream order
+        order = np.argsort(first)
+        rows_get = self._id_to_idx.get
+        found = []
+        _append = found.append
+        if create:
+            state = self._state
+            for cid in uniq[order].tolist():
+                r = rows_get(cid)
+                _append(state(cid) if r is None else r)
+        else:
+            live = self.live_ids
+            for cid in uniq[order].tolist():
+                _append(rows_get(cid) if cid in live else -1)
+        rows = np.empty(len(uniq), dtype=np.int32)
+        rows[order] = found
+        return rows[inv]
+
+    def _fully_disqualified(self) -> np.ndarray:
+        in_len = np.arange(MAX_CAN_DLC) < self.seen_len[:, None]
+        return (self.seen_len > 0) & np.all(self.disq | ~in_len, axis=1)
+
+    # The hot loops below only do work; calibrate/monitor pick a verbose or a quiet driver
+    # once per pass, so the quiet path carries no progress bookkeeping at all.
+    def _calib_loop(self, frames: Iterable[Frame], chunk: int) -> Iterable[int]:
+        kernel = _calib_kernel if HAVE_NUMBA else _calib_numpy
+        for ids, lens, D in _iter_chunks(frames, chunk):
+            kernel(self._rows(ids, create=True), lens, D, self.values, self.disq, self.seen_len)
+            yield len(ids)
+
+    def _monitor_loop(self, frames: Iterable[Frame], chunk: int, out_buf: List[str]) -> Iterable[Tuple[int, int, bool]]:
+        """Yields (frames, changes, whether the chunk's last frame belongs to a live ID)."""
+        out = np.empty((chunk * MAX_CAN_DLC, 4), dtype=np.int32)
+        _append = out_buf.append
+        kernel = _monitor_kernel if HAVE_NUMBA else _monitor_numpy
+        for ids, lens, D in _iter_chunks(frames, chunk):
+            rows = self._rows(ids, create=False)
+            n = kernel(rows, lens, D, self.values, self.disq, self.seen_len, out)
+            if n:
+                id_list = ids.tolist()
+                for k, i, old, new in out[:n].tolist():
+                    _append(f"Change ID={id_list[k]:03X} Byte={i} Old={old:02X} New={new:02X}\n")
+            yield len(ids), n, bool(len(rows)) and rows[-1] >= 0
 
     def calibrate(self, frames: Iterable[Frame], label: str = "calib"):
         print("--------- Calibration Start ----------")
-        cnt = 0
-        for fr in frames:
-            self._state(fr.can_id).ingest_for_calibration(fr.data)
-            cnt += 1
-            if self.verbose and cnt % 5000 == 0:
-                print(f"[DBG] {label}: processed {cnt} frames...")
+        if self.verbose:
+            # Progress is reported every 5000 frames, so chunk on that boundary
+            cnt = 0
+            for n in self._calib_loop(frames, 5000):
+                cnt += n
+                if cnt % 5000 == 0:
+                    print(f"[DBG] {label}: processed {cnt} frames...")
+        else:
+            cnt = sum(self._calib_loop(frames, CHUNK_FRAMES))
+        fully = self._fully_disqualified()
+        self.live_ids = {cid for cid, r in self._id_to_idx.items() if self.seen_len[r] > 0 and not fully[r]}
         print(f"[INFO] Calibration processed frames: {cnt}")
         print("--------- Calibration Complete --------")
-        printed = 0
-        for cid in sorted(self.states.keys()):
-            st = self.states[cid]
-            if st.seen_len == 0 or st.fully_disqualified:
+        # One Python-list snapshot of the state, then a single write for the whole table
+        values, disq, seen = self.values.tolist(), self.disq.tolist(), self.seen_len.tolist()
+        lines = []
+        for cid in sorted(self._id_to_idx):
+            r = self._id_to_idx[cid]
+            if seen[r] == 0 or fully[r]:
                 continue
-            row = []
-            for i in range(st.seen_len):
-                bs = st.bytes[i]
-                row.append("XX" if bs.disqualified else f"{bs.value:02X}")
-            print(f"{cid:03X} " + " ".join(row))
-            printed += 1
+            vals, dq = values[r], disq[r]
+            row = " ".join("XX" if dq[i] else f"{vals[i]:02X}" for i in range(seen[r]))
+            lines.append(f"{cid:03X} {row}\n")
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
+        printed = len(lines)
         if self.verbose:
             print(f"[DBG] Calibration summary rows printed: {printed}")
 
@@ -154,64 +741,78 @@ class ReverseTool:
         print("--------- Monitoring Start -----------")
         cnt = 0
         changes_total = 0
-        for fr in frames:
-            st = self.states.get(fr.can_id)
-            if not st or st.fully_disqualified or st.seen_len == 0:
-                cnt += 1
-                continue
-            changes = st.diff_and_report(fr.data)
-            if changes:
-                for i, old, new in changes:
-                    print(f"Change ID={fr.can_id:03X} Byte={i} Old={old:02X} New={new:02X}")
-                    changes_total += 1
-            cnt += 1
-            if self.verbose and cnt % 5000 == 0:
-                print(f"[DBG] {label}: processed {cnt} frames... changes so far={changes_total}")
+        out_buf: List[str] = []
+        if self.verbose:
+            for n, changes, last_live in self._monitor_loop(frames, 5000, out_buf):
+                cnt += n
+                changes_total += changes
+                # Frames of dead IDs are skipped without a progress check, so a 5000th
+                # frame from one reports nothing
+                if cnt % 5000 == 0 and last_live:
+                    # Keep the progress line after the changes it counts
+                    sys.stdout.writelines(out_buf)
+                    out_buf.clear()
+                    print(f"[DBG] {label}: processed {cnt} frames... changes so far={changes_total}")
+        else:
+            for n, changes, _ in self._monitor_loop(frames, CHUNK_FRAMES, out_buf):
+                cnt += n
+                changes_total += changes
+                if len(out_buf) >= MONITOR_FLUSH_LINES:
+                    sys.stdout.writelines(out_buf)
+                    out_buf.clear()
+        sys.stdout.writelines(out_buf)
         print(f"[INFO] Monitoring processed frames: {cnt}, changes printed: {changes_total}")
         print("--------- Monitoring Complete --------")
 
     def read_mode(self, frames: Iterable[Frame], filter_id: int, byte_idxs: Optional[List[int]]):
         print(f"------- Read Mode: ID 0x{filter_id:03X} -------")
+        if isinstance(frames, FrameTable):
+            frames = frames[frames.ids == filter_id]
         hits = 0
         all_bytes = byte_idxs is None
+        prefix = f"  {filter_id:03X}  bytes[{'all' if all_bytes else ','.join(map(str, byte_idxs))}]: "
+        idxs = () if all_bytes else tuple(byte_idxs)
+        out_buf: List[str] = []
+        _append = out_buf.append
         for fr in frames:
             if fr.can_id != filter_id:
                 continue
             hits += 1
+            data = fr.data
             if all_bytes:
-                idxs = list(range(fr.dlc))
-                vals = [f"{b:02X}" for b in fr.data]
+                vals = data.hex(' ').upper()
             else:
-                idxs = byte_idxs
-                vals = [f"{fr.data[i]:02X}" if i < fr.dlc else "--" for i in byte_idxs]
+                n = min(fr.dlc, len(data))
+                vals = " ".join(_HEX_BYTE[data[i]] if i < n else "--" for i in idxs)
             ts = f"{fr.ts:.6f}" if fr.ts is not None else "-"
-            print(f"t={ts}  {filter_id:03X}  bytes[{','.join(map(str, idxs)) if not all_bytes else 'all'}]: {' '.join(vals)}")
+            _append(f"t={ts}{prefix}{vals}\n")
+            if len(out_buf) >= MONITOR_FLUSH_LINES:
+                sys.stdout.writelines(out_buf)
+                out_buf.clear()
+        sys.stdout.writelines(out_buf)
         if self.verbose:
             print(f"[DBG] Read-mode frames matched for 0x{filter_id:03X}: {hits}")
 
     def variance_report(self, frames: List[Frame], top_n: int = 15):
-        from collections import defaultdict
-        sums = defaultdict(lambda: [0]*MAX_CAN_DLC)
-        sums2 = defaultdict(lambda: [0]*MAX_CAN_DLC)
-        counts = defaultdict(int)
-        for idx, fr in enumerate(frames):
-            counts[fr.can_id] += 1
-            for i in range(min(fr.dlc, MAX_CAN_DLC)):
-                b = fr.data[i]
-                sums[fr.can_id][i] += b
-                sums2[fr.can_id][i] += b*b
-            if self.verbose and (idx+1) % 10000 == 0:
-                print(f"[DBG] variance: processed {idx+1} frames...")
+        ids, _, D = _materialize(frames)
+        # Dense row per ID, so the per-ID sums live in fixed-size arrays
+        uniq, first_idx, inverse, counts = _dense_ids(ids)
+        nu = len(uniq)
+        score = np.zeros(nu)
+        for i in range(MAX_CAN_DLC):
+            col = D[:, i].astype(np.float64)
+            mean = np.bincount(inverse, weights=col, minlength=nu) / counts
+            mean2 = np.bincount(inverse, weights=col * col, minlength=nu) / counts
+            score += np.maximum(0.0, mean2 - mean*mean)
+        if self.verbose:
+            print(f"[DBG] variance: processed {len(ids)} frames...")
+        # Walk IDs in first-seen order so ties rank the same as the per-frame version
         scores = []
-        for cid, n in counts.items():
+        for k in np.argsort(first_idx):
+            n = int(counts[k])
             if n < 2:
                 continue
-            score = 0.0
-            for i in range(MAX_CAN_DLC):
-                mean = sums[cid][i] / n
-                var = max(0.0, (sums2[cid][i] / n) - (mean*mean))
-                score += var
-            scores.append((cid, score, n))
+            scores.append((int(uniq[k]), float(score[k]), n))
         scores.sort(key=lambda x: x[1], reverse=True)
         print(f"------ Variance Top {top_n} ------")
         for cid, sc, n in scores[:top_n]:
@@ -220,27 +821,37 @@ class ReverseTool:
             print(f"[DBG] variance: IDs ranked = {len(scores)}")
 
     def id_summary(self, frames: List[Frame], top_n: int = 30):
-        from collections import defaultdict, deque
-        counts: Dict[int,int] = defaultdict(int)
-        first: Dict[int,bytes] = {}
-        last: Dict[int,bytes] = {}
-        for idx, fr in enumerate(frames):
-            counts[fr.can_id] += 1
-            if fr.can_id not in first:
-                first[fr.can_id] = fr.data
-            last[fr.can_id] = fr.data
-        items = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:top_n]
-        print("------ ID Summary (top by frame count) ------")
-        for cid, n in items:
-            fhex = first[cid].hex(' ')
-            lhex = last[cid].hex(' ')
-            print(f"{cid:03X}  frames={n:6d}  first={fhex}  last={lhex}")
+        ids, lens, D = _materialize(frames)
+        uniq, first_idx, _, counts = _dense_ids(ids)
+        # Last occurrence is the first one in the reversed stream; uniq comes back sorted both times
+        last_idx = len(ids) - 1 - _dense_ids(ids[::-1])[1]
+        # First-seen order, then a stable sort, so equal counts keep the per-frame version's order
+        order = np.argsort(first_idx, kind="stable")
+        order = order[np.argsort(-counts[order], kind="stable")][:top_n]
+        lines = ["------ ID Summary (top by frame count) ------\n"]
+        for cid, n, f, l in zip(uniq[order].tolist(), counts[order].tolist(),
+                                first_idx[order].tolist(), last_idx[order].tolist()):
+            fhex = D[f, :lens[f]].tobytes().hex(' ')
+            lhex = D[l, :lens[l]].tobytes().hex(' ')
+            lines.append(f"{cid:03X}  frames={n:6d}  first={fhex}  last={lhex}\n")
+        sys.stdout.write("".join(lines))
         if self.verbose:
-            print(f"[DBG] id_summary: unique IDs = {len(counts)}")
+            print(f"[DBG] id_summary: unique IDs = {len(uniq)}")
 
 # ---------- Helpers ----------
 
 def slice_by_time(frames: List[Frame], start: float, end: float) -> Iterable[Frame]:
+    if isinstance(frames, FrameTable):
+        ts = frames.ts
+        if frames.time_sorted():
+            # Monotonic timestamps (the usual candump case): the window is one contiguous slice
+            lo, hi = np.searchsorted(ts, [start, end], side="left")
+            return frames[lo:hi]
+        # Untimed frames always pass, as below
+        return frames[np.isnan(ts) | ((ts >= start) & (ts < end))]
+    return _slice_frames_by_time(frames, start, end)
+
+def _slice_frames_by_time(frames: Iterable[Frame], start: float, end: float) -> Iterable[Frame]:
     for fr in frames:
         if fr.ts is None:
             yield fr
@@ -259,16 +870,32 @@ def main():
     ap.add_argument("--variance", choices=["top"], help="Print variance ranking")
     ap.add_argument("--id-summary", action="store_true", help="Print per-ID counts and first/last payloads")
     ap.add_argument("--limit", type=int, help="Limit number of frames parsed from file")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Parser processes for large dumps (ignored with --limit). With more than one, dumps too "
+                         "big to hold are parsed whole instead of streamed (streaming re-parses on every pass)")
     ap.add_argument("--verbose", action="store_true", help="Verbose debug logging")
     args = ap.parse_args()
 
-    frames = parse_candump(args.dump, limit=args.limit, verbose=args.verbose)
-    if not frames:
-        sys.exit(1)
-
-    have_ts = frames[0].ts is not None and frames[-1].ts is not None
-    t_min = frames[0].ts if have_ts else None
-    t_max = frames[-1].ts if have_ts else None
+    # Explicit calib/monitor windows never auto-split by time, so without a whole-dump
+    # analysis a very large dump can be streamed pass by pass instead of held in memory.
+    # Streaming re-parses the file on every pass, so it is only worth it past
+    # STREAM_MIN_BYTES, and --jobs asks for a (parallel) whole-dump parse instead.
+    stream = ((args.calib > 0 or args.monitor > 0) and not (args.id_summary or args.variance)
+              and args.jobs <= 1 and os.path.getsize(args.dump) >= STREAM_MIN_BYTES)
+    if stream:
+        frames = FrameStream(args.dump, limit=args.limit, verbose=args.verbose)
+        if not frames:
+            sys.exit(1)
+        first, last = frames.first, frames.last
+    else:
+        frames = parse_candump(args.dump, limit=args.limit, verbose=args.verbose, jobs=args.jobs)
+        if not frames:
+            sys.exit(1)
+        first, last = frames[0], frames[-1]
+
+    have_ts = first.ts is not None and last.ts is not None
+    t_min = first.ts if have_ts else None
+    t_max = last.ts if have_ts else None
     if args.verbose:
         print(f"[INFO] Timestamp present: {have_ts}; t_min={t_min}, t_max={t_max}")
 
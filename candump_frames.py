@@ -0,0 +1,116 @@
+"""
+candump_frames.py
+
+Parsed candump frames as NumPy column arrays, shared by can_reverse_from_dump_debug.py
+and plot_wheels.py: the FrameTable container, the conversion of regex-matched text
+columns into it, and the optional-numba njit shim both scripts' kernels use.
+"""
+
+from dataclasses import dataclass, field
+from typing import ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; @njit kernels then run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+MAX_CAN_DLC = 8
+
+# ASCII hex digit -> value, -1 for anything else (incl. the NUL padding of S arrays)
+HEXVAL = np.full(256, -1, dtype=np.int8)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    HEXVAL[_c] = _i
+    HEXVAL[bytes([_c]).upper()[0]] = _i
+del _i, _c
+
+@dataclass
+class Frame:
+    ts: Optional[float]
+    can_id: int
+    dlc: int
+    data: bytes
+
+@dataclass
+class FrameTable:
+    """Parsed frames as parallel arrays; row k is the k-th frame in file (or sorted) order."""
+    ts: np.ndarray    # float64[N], NaN where the line had no timestamp
+    ids: np.ndarray   # uint32[N]
+    dlcs: np.ndarray  # uint8[N], DLC as printed by candump
+    lens: np.ndarray  # uint8[N], payload bytes actually present (<= dlc)
+    D: np.ndarray     # uint8[N,8], payloads zero-padded to 8 bytes
+    _by_id: Optional[Dict[int, np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    _time_sorted: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = ("ts", "ids", "dlcs", "lens", "D")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _frame(self, k: int) -> Frame:
+        ts = float(self.ts[k])
+        return Frame(None if ts != ts else ts, int(self.ids[k]), int(self.dlcs[k]), self.D[k, :self.lens[k]].tobytes())
+
+    def __getitem__(self, key):
+        """An int gives that Frame; a slice, index array or boolean mask gives a sub-table."""
+        if isinstance(key, (slice, np.ndarray)):
+            return FrameTable(self.ts[key], self.ids[key], self.dlcs[key], self.lens[key], self.D[key])
+        return self._frame(range(len(self))[key])
+
+    def __iter__(self) -> Iterable[Frame]:
+        # Frame views for the per-frame code paths; bulk analyses use the arrays directly
+        raw = self.D.tobytes()
+        for k, (ts, cid, dlc, n) in enumerate(zip(self.ts.tolist(), self.ids.tolist(), self.dlcs.tolist(), self.lens.tolist())):
+            off = k * MAX_CAN_DLC
+            yield Frame(None if ts != ts else ts, cid, dlc, raw[off:off + n])
+
+    def rows_with(self, cid: int, min_len: int = 0) -> np.ndarray:
+        """Row indices, in order, of frames with this ID and at least min_len payload bytes.
+        The ID -> rows index is built on first use, so each lookup is a dict hit."""
+        if self._by_id is None:
+            order = np.argsort(self.ids, kind="stable")
+            uniq, starts = np.unique(self.ids[order], return_index=True)
+            self._by_id = dict(zip(uniq.tolist(), np.split(order, starts[1:])))
+        idx = self._by_id.get(cid, np.zeros(0, dtype=np.intp))
+        return idx[self.lens[idx] >= min_len] if min_len else idx
+
+    def time_sorted(self) -> bool:
+        """True when every frame has a timestamp and they never decrease, so time windows
+        are contiguous row ranges. Checked once per table, then cached."""
+        if self._time_sorted is None:
+            ts = self.ts
+            self._time_sorted = not np.isnan(ts).any() and not (ts[1:] < ts[:-1]).any()
+        return self._time_sorted
+
+def concat_tables(tables: List[FrameTable]) -> FrameTable:
+    return FrameTable(*(np.concatenate([getattr(t, name) for t in tables]) for name in FrameTable.COLUMNS))
+
+def hex_digits(col: np.ndarray, width: int) -> np.ndarray:
+    """Left-aligned hex digit strings (S dtype) as digit values, -1 past the end: int16[N,width]."""
+    return HEXVAL[col.astype(f"S{width}").view(np.uint8).reshape(-1, width)].astype(np.int16)
+
+def frame_columns(rows: Sequence[Tuple[bytes, bytes, bytes, bytes]]) -> FrameTable:
+    """(ts, id, dlc, data) byte-string rows, as a candump regex's findall() returns them
+    (ts b"" when absent, data as single-space separated hex pairs) -> FrameTable, in order."""
+    n = len(rows)
+    cols = np.array(rows, dtype=np.bytes_).reshape(n, 4)
+    ts = np.full(n, np.nan)
+    has_ts = cols[:, 0] != b""
+    ts[has_ts] = cols[has_ts, 0].astype(np.float64)
+    dlcs = cols[:, 2].astype(np.uint8)
+    ids = np.zeros(n, dtype=np.int64)
+    for digit in hex_digits(cols[:, 1], 8).T:
+        ids = np.where(digit >= 0, ids * 16 + digit, ids)
+    # Payload "hh hh ..." puts byte j's nibbles at columns 3j and 3j+1
+    nib = hex_digits(cols[:, 3], 3 * MAX_CAN_DLC - 1)
+    hi, lo = nib[:, 0::3], nib[:, 1::3]
+    lens = np.minimum(np.count_nonzero(hi >= 0, axis=1), dlcs).astype(np.uint8)
+    D = np.where(np.arange(MAX_CAN_DLC) < lens[:, None], hi * 16 + lo, 0).astype(np.uint8)
+    return FrameTable(ts, ids.astype(np.uint32), dlcs, lens, D)
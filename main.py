@@ -138,9 +138,13 @@ def probe_wheelspeed_dids(tx, rx, dids):
     return found
 
 
+# Four big-endian u16 wheel speeds; compiled once instead of per poll
+_WHEELS4 = struct.Struct(">HHHH")
+_wheels4_unpack = _WHEELS4.unpack_from
+
 def decode_four_wheels(payload: bytes):
     if len(payload) >= 8:
-        fl, fr, rl, rr = struct.unpack(">HHHH", payload[:8])
+        fl, fr, rl, rr = _wheels4_unpack(payload, 0)
         scale = 0.01
         return (fl*scale, fr*scale, rl*scale, rr*scale)
     return None
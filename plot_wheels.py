@@ -32,53 +32,101 @@ python3 plot_wheels.py --car mercedes --dump merc_ts.log \
 python3 plot_wheels.py --car g37 --dump g37_ts.log --units kph
 """
 
-import re, sys, struct, argparse, math
+import re, os, sys, mmap, hashlib, zipfile, argparse, functools
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+
+from candump_frames import HAVE_NUMBA, FrameTable, concat_tables, frame_columns, njit
 
 # ---------- candump parsing ----------
-PAT_TS = re.compile(
-    r"\((?P<ts>[\d\.]+)\)\s+can\d+\s+(?P<id>[0-9A-Fa-f]+)\s+\[(?P<dlc>\d+)\]\s+(?P<data>(?:[0-9A-Fa-f]{2}\s*)+)"
-)
-PAT_NO_TS = re.compile(
-    r"(?:can\d+\s+)?(?P<id>[0-9A-Fa-f]+)\s+\[(?P<dlc>\d+)\]\s+(?P<data>(?:[0-9A-Fa-f]{2}\s*)+)"
-)
+# One bytes pattern for all three layouts, run over the whole mmapped file:
+#   "(ts) IFACE ID [dlc] data", "IFACE ID [dlc] data" and bare "ID [dlc] data",
+# IFACE being any interface name (can0, vcan0 from canplayer, slcan0 ...).
+# It only starts at a line start (after "\n" or a lone "\r") and, like the old
+# per-line .match(), ignores whatever follows the payload.
+PAT_FRAME = re.compile(rb"""
+    (?:^|(?<=\r)) [ \t\f\v]*
+    (?: \( (?P<ts>\d+\.?\d*|\.\d+) \) [ \t\f\v]+ [A-Za-z][\w-]* [ \t\f\v]+   # "(ts) IFACE "
+      | [A-Za-z][\w-]* [ \t\f\v]+ )?                                     # "IFACE ", or bare
+    (?P<id>[0-9A-Fa-f]{1,8}) [ \t\f\v]+
+    \[ (?P<dlc>\d{1,2}) \] [ \t\f\v]+
+    (?P<data>[0-9A-Fa-f]{2} (?:[ ][0-9A-Fa-f]{2}){0,7})
+""", re.M | re.X)
+
+PARSE_WINDOW = 16 << 20  # bytes of the mapped dump matched and converted per pass
 
 def parse_dump(path):
-    frames = []
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for ln, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-            m = PAT_TS.search(line) or PAT_NO_TS.search(line)
-            if not m:
-                continue
-            cid = int(m.group("id"), 16)
-            dlc = int(m.group("dlc"))
-            data = bytes(int(b, 16) for b in m.group("data").split())[:dlc]
-            ts = float(m.group("ts")) if "ts" in m.groupdict() and m.group("ts") else None
-            frames.append((ts, cid, data))
-    # If timestamps exist, sort by them
-    if frames and frames[0][0] is not None:
-        frames.sort(key=lambda t: t[0])
+    # Match and convert the mapping a window at a time (cut after a "\n"), so the
+    # per-match tuples never exist for more than PARSE_WINDOW bytes of dump at once.
+    parts = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 0
+                while pos < size:
+                    end = mm.rfind(b"\n", pos, pos + PARSE_WINDOW) + 1 if size - pos > PARSE_WINDOW else size
+                    if end <= pos:  # no "\n" in the window: run to the next one
+                        end = mm.find(b"\n", pos + PARSE_WINDOW) + 1 or size
+                    parts.append(frame_columns(PAT_FRAME.findall(mm, pos, end)))
+                    pos = end
+    if len(parts) == 1:
+        frames = parts[0]
+    elif parts:
+        frames = concat_tables(parts)
+    else:
+        frames = frame_columns([])
+    # If timestamps exist, sort by them (candump -t output normally already is; NaN fails the check)
+    ts = frames.ts
+    if len(frames) and not np.isnan(ts[0]) and not np.all(ts[1:] >= ts[:-1]):
+        frames = frames[np.argsort(ts, kind="stable")]
+    return frames
+
+# Parsed dumps are cached as .npz keyed by (absolute path, mtime, size), so replotting the
+# same capture with other options skips the parse; bump the version when parsing changes
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "canInspect")
+CACHE_VERSION = 2
+
+def parse_dump_cached(path, cache_dir=CACHE_DIR):
+    st = os.stat(path)
+    key = f"{CACHE_VERSION}\0{os.path.abspath(path)}\0{st.st_mtime_ns}\0{st.st_size}"
+    cache = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npz")
+    try:
+        with np.load(cache) as z:
+            return FrameTable(*(z[a] for a in FrameTable.COLUMNS))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):  # missing, damaged or stale cache: reparse
+        pass
+    frames = parse_dump(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache[:-4]}.{os.getpid()}.tmp.npz"  # write then rename, so readers never see half a file
+        np.savez(tmp, **{a: getattr(frames, a) for a in FrameTable.COLUMNS})
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # the cache is only an optimization
     return frames
 
 # ---------- G37 decoder ----------
 G37_SCALE_KPH = 0.005
+
 def decode_g37(frames):
-    x, fl, fr, rl, rr, ts_out = [], [], [], [], [], []
-    for idx, (ts, cid, data) in enumerate(frames):
-        if cid == 0x284 and len(data) >= 4:  # fronts
-            w1 = struct.unpack(">H", data[0:2])[0] * G37_SCALE_KPH  # FR
-            w2 = struct.unpack(">H", data[2:4])[0] * G37_SCALE_KPH  # FL
-            fr.append(w1); fl.append(w2); rr.append(None); rl.append(None)
-            ts_out.append(ts if ts is not None else idx); x.append(idx)
-        elif cid == 0x285 and len(data) >= 4:  # rears
-            w1 = struct.unpack(">H", data[0:2])[0] * G37_SCALE_KPH  # RR
-            w2 = struct.unpack(">H", data[2:4])[0] * G37_SCALE_KPH  # RL
-            rr.append(w1); rl.append(w2); fr.append(None); fl.append(None)
-            ts_out.append(ts if ts is not None else idx); x.append(idx)
-    return ts_out, fl, fr, rl, rr, "kph"
+    """Returns (t, fl, fr, rl, rr, units) as float arrays, one entry per 0x284/0x285 frame;
+    the wheels a frame doesn't carry are NaN, t falls back to the frame index."""
+    rows_f = frames.rows_with(0x284, 4)  # fronts
+    rows_r = frames.rows_with(0x285, 4)  # rears
+    x = np.concatenate((rows_f, rows_r))
+    order = np.argsort(x, kind="stable")
+    x = x[order]
+    front = order < len(rows_f)
+    # Both wheels are big-endian u16 in bytes 0..1 and 2..3
+    u16 = frames.D[x, :4].view(">u2") * G37_SCALE_KPH
+    w1, w2 = u16[:, 0], u16[:, 1]  # FR/RR, FL/RL
+    fl = np.where(front, w2, np.nan); fr = np.where(front, w1, np.nan)
+    rl = np.where(front, np.nan, w2); rr = np.where(front, np.nan, w1)
+    ts = frames.ts[x]
+    return np.where(np.isnan(ts), x, ts), fl, fr, rl, rr, "kph"
 
 # ---------- Mercedes decoders ----------
 MERCEDES_WHEEL_DBC = r"""
@@ -97,8 +145,37 @@ BO_ 515 WHEEL_SPEEDS: 8 XXX
  SG_ WHEEL_SPEED_RR : 50|11@0+ (0.0375,0) [0|255] "mph" XXX
 """
 
-def diff_u8_wrap(prev, cur):
-    return (cur - prev) % 256
+@functools.lru_cache(maxsize=8)
+def _wheel_message(path, mtime):
+    import cantools
+    if path:
+        db = cantools.database.load_file(path)
+    else:
+        db = cantools.database.load_string(MERCEDES_WHEEL_DBC, database_format='dbc')
+    try:
+        return db.get_message_by_name("WHEEL_SPEEDS")
+    except KeyError:
+        return db.get_message_by_frame_id(515)
+
+def wheel_message(dbc_path=None):
+    """WHEEL_SPEEDS (or frame 515) from dbc_path or the built-in DBC, parsed once per file version."""
+    if not dbc_path:
+        return _wheel_message(None, None)
+    return _wheel_message(os.path.abspath(dbc_path), os.path.getmtime(dbc_path))
+
+def signal_values(D, sig):
+    """Physical values of one cantools signal for every row of a uint8[N,8] payload matrix."""
+    mask = np.uint64((1 << sig.length) - 1)
+    if sig.byte_order == "big_endian":
+        # DBC start bit is the MSB in sawtooth numbering; convert to a big-endian bit offset
+        msb = (sig.start // 8) * 8 + (7 - sig.start % 8)
+        raw = (D.view(">u8")[:, 0] >> np.uint64(64 - msb - sig.length)) & mask
+    else:
+        raw = (D.view("<u8")[:, 0] >> np.uint64(sig.start)) & mask
+    if sig.is_signed:
+        pad = np.uint64(64 - sig.length)
+        raw = (raw << pad).view(np.int64) >> pad.astype(np.int64)
+    return raw * float(sig.scale) + float(sig.offset)
 
 def decode_mercedes(frames, dbc_path=None, wheel_id=0x201, fmt="counters",
                     scale=None, dir_id=0x200, esp_id=0x200,
@@ -108,170 +185,195 @@ def decode_mercedes(frames, dbc_path=None, wheel_id=0x201, fmt="counters",
       - 'dbc11'  : use DBC (515/0x203 layout)
       - 'bytes'  : interpret 0x201 as raw byte values (FL,FR,RL,RR)
       - 'counters': interpret 0x201 as 8-bit counters -> Δticks/Δt
-    Returns: (t_list, fl, fr, rl, rr, units, esp_spans, brake_series)
+    Returns: (t, fl, fr, rl, rr, units, esp_spans, brake_series), series as float arrays
       esp_spans: list of (t_start, t_end) where ESP flag true
     """
     # Pre-extract frames of interest
-    wheel_samples = []   # (ts, data)
-    esp_samples = []     # (ts, data) for esp flags/brake overlay
-    for ts, cid, data in frames:
-        if cid == wheel_id and len(data) >= 4:
-            wheel_samples.append((ts, data))
-        if cid == esp_id and len(data) > 0:
-            esp_samples.append((ts, data))
+    wheel_rows = frames[frames.rows_with(wheel_id, 4)]
+    esp_rows = frames[frames.rows_with(esp_id, 1)]  # esp flags/brake overlay
 
     # --- ESP overlay detection (simple OR of two bits) ---
-    def get_bit(b, bit_index):
-        if bit_index < 0: return 0
-        byte = bit_index // 8
-        shift = 7 - (bit_index % 8)
-        if byte >= len(b): return 0
-        return (b[byte] >> shift) & 0x1
-
-    esp_ts = []
-    esp_on = []
-    for ts, b in esp_samples:
-        bl = get_bit(b, esp_bl_bit)
-        dl = get_bit(b, esp_dl_bit)
-        esp_ts.append(ts if ts is not None else math.nan)
-        esp_on.append(1 if (bl or dl) else 0)
-
-    # Convert discrete on/off to spans (t_start, t_end)
-    esp_spans = []
-    if esp_ts and all(t is not None for t in esp_ts):
-        cur_on = 0
-        t0 = None
-        for i in range(len(esp_ts)):
-            if esp_on[i] and not cur_on:
-                t0 = esp_ts[i]; cur_on = 1
-            elif (not esp_on[i]) and cur_on:
-                esp_spans.append((t0, esp_ts[i])); cur_on = 0
-        if cur_on:
-            esp_spans.append((t0, esp_ts[-1]))
+    # Bits are numbered MSB-first, so bit i is bit 63-i of the big-endian u64 payload; both
+    # fold into one mask (indices outside 0..63 never fire, bytes past the payload are 0)
+    esp_mask = 0
+    for bit_index in (esp_bl_bit, esp_dl_bit):
+        if 0 <= bit_index < 64:
+            esp_mask |= 1 << (63 - bit_index)
+    esp_ts = esp_rows.ts
+    esp_on = ((esp_rows.D.view(">u8")[:, 0] & np.uint64(esp_mask)) != 0).astype(np.int8)
+
+    # Convert discrete on/off to spans (t_start, t_end): rising edges open a span, falling
+    # edges close it at that sample; the 0 padding closes a span still open at the end,
+    # which is clipped back onto the last sample
+    edges = np.diff(esp_on, prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.minimum(np.flatnonzero(edges == -1), len(esp_ts) - 1)
+    esp_spans = list(zip(esp_ts[starts].tolist(), esp_ts[ends].tolist()))
 
     # --- Decode wheels ---
     if fmt == "dbc11":
-        import cantools
-        if dbc_path:
-            db = cantools.database.load_file(dbc_path)
-        else:
-            db = cantools.database.load_string(MERCEDES_WHEEL_DBC, database_format='dbc')
-        try:
-            msg = db.get_message_by_name("WHEEL_SPEEDS")
-        except KeyError:
-            msg = db.get_message_by_frame_id(515)
-
-        t, fl, fr, rl, rr = [], [], [], [], []
-        for ts, data in wheel_samples:
-            try:
-                d = msg.decode(data)
-            except Exception:
-                continue
-            t.append(ts)
-            fl.append(float(d.get("WHEEL_SPEED_FL", 0.0)))
-            fr.append(float(d.get("WHEEL_SPEED_FR", 0.0)))
-            rl.append(float(d.get("WHEEL_SPEED_RL", 0.0)))
-            rr.append(float(d.get("WHEEL_SPEED_RR", 0.0)))
+        msg = wheel_message(dbc_path)
+
+        # Decode all frames at once straight from the signal layout (no msg.decode() per frame);
+        # frames shorter than the message can't be decoded and are dropped, as before
+        rows = wheel_rows[wheel_rows.lens >= msg.length]
+        t = rows.ts
+        signals = {sig.name: sig for sig in msg.signals}
+        def wheel(name):
+            if name not in signals:
+                return np.zeros(len(rows))
+            return signal_values(rows.D, signals[name])
+        fl, fr = wheel("WHEEL_SPEED_FL"), wheel("WHEEL_SPEED_FR")
+        rl, rr = wheel("WHEEL_SPEED_RL"), wheel("WHEEL_SPEED_RR")
         return t, fl, fr, rl, rr, "mph", esp_spans, None
 
     if fmt == "bytes":
-        t, fl, fr, rl, rr = [], [], [], [], []
-        for ts, data in wheel_samples:
-            b0, b1, b2, b3 = data[0], data[1], data[2], data[3]
-            if scale is None:
-                fl_v, fr_v, rl_v, rr_v = float(b0), float(b1), float(b2), float(b3)
-                units = "raw"
-            else:
-                fl_v, fr_v, rl_v, rr_v = b0scale, b1scale, b2scale, b3scale
-                units = "mph"
-            t.append(ts)
-            fl.append(fl_v); fr.append(fr_v); rl.append(rl_v); rr.append(rr_v)
-        return t, fl, fr, rl, rr, units, esp_spans, None
-
-    # fmt == "counters": turn byte counters into speed via Δticks/Δt
-    t, c0, c1, c2, c3 = [], [], [], [], []
-    for ts, data in wheel_samples:
-        t.append(ts)
-        c0.append(data[0]); c1.append(data[1]); c2.append(data[2]); c3.append(data[3])
-
-    def diff_per_sec(ts_list, vals):
-        out = [0.0]
-        for i in range(1, len(vals)):
-            prev, cur = vals[i-1], vals[i]
-            dt = None if (ts_list[i] is None or ts_list[i-1] is None) else (ts_list[i] - ts_list[i-1])
-            if not dt or dt <= 0:
-                out.append(0.0); continue
-            dv = diff_u8_wrap(prev, cur)
-            out.append(dv / dt)
-        return out
-
-    d0 = diff_per_sec(t, c0)
-    d1 = diff_per_sec(t, c1)
-    d2 = diff_per_sec(t, c2)
-    d3 = diff_per_sec(t, c3)
+        M = wheel_rows.D[:, :4].astype(np.float64)
+        if scale is None:
+            units = "raw"
+        else:
+            M *= scale; units = "mph"
+        fl, fr, rl, rr = M.T
+        return wheel_rows.ts, fl, fr, rl, rr, units, esp_spans, None
+
+    # fmt == "counters": turn byte counters into speed via Δticks/Δt, all four wheels at once
+    t = wheel_rows.ts
+    speed = counter_speeds(t, wheel_rows.D)
 
     if scale is None:
         units = "ticks/s"
-        fl, fr, rl, rr = d0, d1, d2, d3
     else:
         units = "mph"
-        fl = [vscale for v in d0]; fr = [vscale for v in d1]
-        rl = [vscale for v in d2]; rr = [vscale for v in d3]
-
+        speed *= scale
+    fl, fr, rl, rr = speed.T
     return t, fl, fr, rl, rr, units, esp_spans, None
 
+@njit(cache=True)
+def _counters_kernel(ts, D):
+    # One fused pass: wrap-aware u8 tick deltas of bytes 0..3 over the timestamp delta
+    n = D.shape[0]
+    out = np.zeros((n, 4))
+    for i in range(1, n):
+        dt = ts[i] - ts[i - 1]
+        if dt > 0:
+            for w in range(4):
+                out[i, w] = ((D[i, w] - D[i - 1, w]) & 0xFF) / dt
+    return out
+
+def counter_speeds(ts, D):
+    """Ticks/s for the four 8-bit wheel counters in bytes 0..3, float[N,4]; 0.0 on the first
+    row and wherever the timestamp delta isn't positive (incl. missing timestamps)."""
+    if HAVE_NUMBA:
+        return _counters_kernel(ts, D)
+    cnts = D[:, :4].astype(np.int16)
+    dv = np.diff(cnts, axis=0) & 0xFF  # wrap-aware u8 difference
+    dt = np.diff(ts)
+    valid = dt > 0  # False for missing timestamps (NaN) and non-increasing ones
+    speed = np.zeros((len(cnts), 4))
+    speed[1:][valid] = dv[valid] / dt[valid, None]
+    return speed
+
 # ---------- utils ----------
+# Series are float arrays with NaN for "no sample" from here on
 def convert_units(values, src, dst):
     if src == dst: return values
     f = 1.0
     if src == "mph" and dst == "kph": f = 1.609344
     elif src == "kph" and dst == "mph": f = 0.621371
-    return [None if v is None else v * f for v in values]
+    return np.asarray(values, dtype=np.float64) * f
+
+@njit(cache=True)
+def _median_kernel(vals, k):
+    # Causal running median: win holds the last k samples sorted, ring the same in arrival order
+    n = vals.shape[0]
+    out = np.empty(n)
+    win = np.empty(k)
+    ring = np.empty(k)
+    mid = k // 2
+    filled = 0
+    for i in range(n):
+        x = vals[i]
+        if x != x:
+            x = 0.0
+        if filled == k:
+            old = ring[i % k]
+            j = 0
+            while win[j] != old:
+                j += 1
+            while j < k - 1:
+                win[j] = win[j + 1]; j += 1
+            filled -= 1
+        j = filled
+        while j > 0 and win[j - 1] > x:
+            win[j] = win[j - 1]; j -= 1
+        win[j] = x
+        filled += 1
+        ring[i % k] = x
+        out[i] = win[mid] if filled == k else x
+    return out
 
 def median_filter(vals, k=1):
-    if k <= 1 or k % 2 == 0: return vals
-    from collections import deque
-    import bisect
-    win, out, dq = [], [], deque()
-    mid = k // 2
-    for v in vals:
-        x = 0.0 if v is None else v
-        bisect.insort(win, x); dq.append(x)
-        if len(win) > k:
-            old = dq.popleft()
-            win.pop(bisect.bisect_left(win, old))
-        out.append(win[mid] if len(win) == k else x)
+    """Running median over the last k samples (upper median for even k); missing samples
+    count as 0.0 and the first k-1 outputs pass through."""
+    if k <= 1: return vals
+    vals = np.asarray(vals, dtype=np.float64)
+    if HAVE_NUMBA or len(vals) < k:
+        return _median_kernel(vals, k)
+    # Without the JIT: partition every length-k window at once, only the median rank is needed
+    vals = np.nan_to_num(vals, nan=0.0)
+    out = vals.copy()
+    windows = np.lib.stride_tricks.sliding_window_view(vals, k)
+    out[k - 1:] = np.partition(windows, k // 2, axis=1)[:, k // 2]
     return out
 
 def carry(vals):
-    out, last = [], None
-    for v in vals:
-        if v is None:
-            out.append(last if last is not None else 0.0)
-        else:
-            last = v; out.append(v)
-    return out
+    """Forward-fill NaN gaps with the last real sample; 0.0 before the first one."""
+    vals = np.asarray(vals, dtype=np.float64)
+    have = ~np.isnan(vals)
+    idx = np.where(have, np.arange(len(vals)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(have[idx], vals[idx], 0.0)
+
+def decimate_minmax(y, target):
+    """Indices of at most ~target samples keeping each bin's min and max (and both ends),
+    so spikes survive; everything when the series is already short enough."""
+    n = len(y)
+    if not target or n <= target:
+        return np.arange(n)
+    bins = max(target // 2, 1)
+    width = -(-n // bins)
+    base = np.arange(bins) * width
+    # Pad the last bin by repeating the final sample; argmin/argmax keep its first copy
+    Y = y[np.minimum(base[:, None] + np.arange(width), n - 1)]
+    pick = np.sort(np.stack((Y.argmin(axis=1), Y.argmax(axis=1)), axis=1), axis=1) + base[:, None]
+    return np.unique(np.concatenate(([0], np.minimum(pick.ravel(), n - 1), [n - 1])))
 
 # ---------- plotting ----------
-def plot_four(t, fl, fr, rl, rr, units, esp_spans=None, title="Wheel Speeds"):
+def plot_four(t, fl, fr, rl, rr, units, esp_spans=None, title="Wheel Speeds", max_points=None):
     fl = carry(fl); fr = carry(fr); rl = carry(rl); rr = carry(rr)
+    t = np.asarray(t, dtype=np.float64)
+    # Long captures: draw a min/max-preserving subset, thinner and without antialiasing
+    style = {"linewidth": 0.7, "antialiased": False} if max_points and len(t) > max_points else {}
 
     fig, ax = plt.subplots(figsize=(12,6))
-    ax.plot(t, fl, label="Front Left")
-    ax.plot(t, fr, label="Front Right")
-    ax.plot(t, rl, label="Rear Left")
-    ax.plot(t, rr, label="Rear Right")
+    for y, label in ((fl, "Front Left"), (fr, "Front Right"), (rl, "Rear Left"), (rr, "Rear Right")):
+        idx = decimate_minmax(y, max_points)
+        ax.plot(t[idx], y[idx], label=label, **style)
     ax.set_title(title)
-    ax.set_xlabel("Time (s)" if t and t[0] is not None else "Frame index")
+    ax.set_xlabel("Time (s)" if len(t) and not np.isnan(t[0]) else "Frame index")
     ax.set_ylabel(f"Speed ({units})")
     ax.grid(True, linestyle="--", alpha=0.4)
     ax.legend()
 
-    # ESP overlay shading
+    # ESP overlay shading: all spans as one compound full-height patch (x in data, y in
+    # axes coordinates, like axvspan) rather than one patch artist per span
     if esp_spans:
-        ymin, ymax = ax.get_ylim()
-        for (t0, t1) in esp_spans:
-            ax.axvspan(t0, t1, color="red", alpha=0.12)
+        x = np.asarray(esp_spans, dtype=np.float64)
+        verts = np.empty((len(x), 4, 2))
+        verts[:, :, 0] = x[:, [0, 0, 1, 1]]
+        verts[:, :, 1] = (0, 1, 1, 0)
+        ax.add_patch(PathPatch(Path.make_compound_path_from_polys(verts),
+                               transform=ax.get_xaxis_transform(), color="red", alpha=0.12))
 
     plt.tight_layout()
     plt.show()
@@ -298,10 +400,16 @@ def main():
     ap.add_argument("--esp-dl-bit", type=int, default=3,
                     help="Bit index for ESP_INFO_DL (steady)   in --esp-id (default 3)")
     # smoothing
-    ap.add_argument("--median", type=int, default=1, help="Median window (odd int), e.g., 5")
+    ap.add_argument("--median", type=int, default=1, help="Running median window in samples, e.g., 5 (even windows take the upper median; 1 = off)")
+    # parse cache
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Always reparse the dump instead of reusing the parsed copy cached in {CACHE_DIR}")
+    # rendering
+    ap.add_argument("--max-points", type=int, default=20000,
+                    help="Decimate each series to about this many points (min/max kept) before plotting; 0 = all")
     args = ap.parse_args()
 
-    frames = parse_dump(args.dump)
+    frames = parse_dump(args.dump) if args.no_cache else parse_dump_cached(args.dump)
     if not frames:
         print("No frames parsed. Check file and candump format."); sys.exit(1)
 
@@ -334,7 +442,7 @@ def main():
     rr = convert_units(rr, src_units, args.units)
 
     plot_four(t, fl, fr, rl, rr, args.units, esp_spans=esp_spans,
-              title="Wheel Speeds (ESP shaded)")
+              title="Wheel Speeds (ESP shaded)", max_points=args.max_points)
 
 if __name__ == "__main__":
     main()
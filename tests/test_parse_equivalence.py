@@ -0,0 +1,123 @@
+"""Randomized equivalence checks: every byte-level candump parser has to produce exactly
+what the line-based regex parser (_parse_text) produces for the same dump.
+
+    python3 -m unittest discover -s tests
+"""
+
+import io
+import mmap
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import can_reverse_from_dump_debug as rev  # noqa: E402
+
+# Mutations: hex/format characters, all ASCII whitespace (incl. \x1c-\x1f, which str.strip()
+# and the str patterns' \s treat as spaces), line breaks and a few non-ASCII bytes
+MUTATIONS = [c.encode() for c in "0123456789abcdefABCDEF ()[].#canxyz_-\t\x0b\x0c\x1c\x1d\x1e\x1f\r\n"]
+MUTATIONS += [b"\xff", b"\xc2\xa0", b"\x80"]
+SEPARATORS = [b"\n", b"\r\n", b"\r", b"\n\n", b"\n  \t\n"]
+LIMITS = (None, 0, 1, 7, 1000)
+
+def _sample_lines():
+    lines = []
+    for name in ("merc_slip_ts.log", "can0dump.txt"):
+        with open(os.path.join(ROOT, name), "rb") as f:
+            head = f.read().splitlines()[:300]
+        lines += head
+        # Other interface names: canplayer replays (vcan0), slcan adapters (slcan0)
+        lines += [line.replace(b"can0", b"vcan0") for line in head[:50]]
+        lines += [line.replace(b"can0", b"slcan0") for line in head[50:100]]
+    return lines
+
+def _random_dump(rng: random.Random, lines, ascii_only: bool) -> bytes:
+    rate = rng.choice([0, 0, 0.001, 0.02, 0.2])
+    mutations = [m for m in MUTATIONS if m < b"\x80"] if ascii_only else MUTATIONS
+    out = []
+    for _ in range(rng.randint(0, 200)):
+        line = rng.choice(lines)
+        if rng.random() < 0.2:
+            line = b"  " + line + b" \t"
+        if rng.random() < 0.05:
+            line += b" trailing junk"
+        if rng.random() < rate:
+            i = rng.randrange(len(line) + 1)
+            line = line[:i] + rng.choice(mutations) + line[i:]
+        out.append(line)
+    sep = rng.choice(SEPARATORS)
+    return sep.join(out) + rng.choice([b"", sep, b" "])
+
+def _text_parse(raw: bytes, limit):
+    return rev._parse_text(io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8", errors="ignore"), limit)
+
+class ParseEquivalenceTest(unittest.TestCase):
+    ITERATIONS = 150
+
+    @classmethod
+    def setUpClass(cls):
+        cls.lines = _sample_lines()
+
+    def assertSameParse(self, got, want, raw, limit):
+        msg = f"limit={limit} dump={raw[:200]!r}"
+        self.assertEqual(got[1:], want[1:], msg)
+        for name in ("ts", "ids", "dlcs", "lens", "D"):
+            np.testing.assert_array_equal(getattr(got[0], name), getattr(want[0], name), err_msg=f"{name}: {msg}")
+
+    @unittest.skipUnless(rev.HAVE_NUMBA, "the byte parser only runs compiled")
+    def test_byte_parser_matches_text_parser(self):
+        rng = random.Random(1)
+        for _ in range(self.ITERATIONS):
+            raw = _random_dump(rng, self.lines, ascii_only=True)
+            for limit in LIMITS:
+                got = rev._parse_bytes(np.frombuffer(raw, dtype=np.uint8), limit)
+                if got is not None:  # None: a timestamp too long to convert exactly
+                    self.assertSameParse(got, _text_parse(raw, limit), raw, limit)
+
+    def test_frame_regex_matches_text_parser(self):
+        rng = random.Random(2)
+        for _ in range(self.ITERATIONS):
+            raw = _random_dump(rng, self.lines, ascii_only=True)
+            for limit in LIMITS:
+                got = rev._scan_frame_lines(raw, 0, len(raw), limit)
+                if got is not None:  # None: some line needs the line-based parser
+                    self.assertSameParse(got, _text_parse(raw, limit), raw, limit)
+
+    def test_interface_name_does_not_matter(self):
+        raw = b"\n".join(line for line in self.lines if b" can0 " in line or line.startswith(b"can0 "))
+        want = _text_parse(raw, None)
+        self.assertGreater(len(want[0]), 0)
+        for iface in (b"vcan0", b"slcan0", b"can_1", b"my-bus"):
+            renamed = raw.replace(b"can0", iface)
+            self.assertSameParse(_text_parse(renamed, None), want, renamed, None)
+            got = rev._scan_frame_lines(renamed, 0, len(renamed), None)
+            self.assertIsNotNone(got)
+            self.assertSameParse(got, want, renamed, None)
+            if rev.HAVE_NUMBA:
+                self.assertSameParse(rev._parse_bytes(np.frombuffer(renamed, dtype=np.uint8), None), want, renamed, None)
+
+    def test_parse_mapped_matches_text_parser(self):
+        # Whichever byte parser is active, including on dumps with non-ASCII bytes
+        rng = random.Random(3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dump.log")
+            for _ in range(self.ITERATIONS):
+                raw = _random_dump(rng, self.lines, ascii_only=False)
+                if not raw:
+                    continue  # an empty file cannot be mapped
+                with open(path, "wb") as f:
+                    f.write(raw)
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for limit in LIMITS:
+                        got = rev._parse_mapped(mm, 0, len(raw), limit)
+                        if got is not None:
+                            self.assertSameParse(got, _text_parse(raw, limit), raw, limit)
+
+if __name__ == "__main__":
+    unittest.main()